@@ -16,6 +16,7 @@ Document - 任务完成记录工具
 """
 
 import argparse
+import functools
 import json
 import os
 import re
@@ -27,11 +28,18 @@ from typing import Any, Dict, List, Optional
 
 # 导入 CodeAnalyzer
 try:
-    from code_analyzer import CodeAnalyzer
+    from code_analyzer import CodeAnalyzer, json_dumps, json_loads, load_task
 except ImportError:
     # 如果直接运行此脚本，尝试从同一目录导入
     sys.path.insert(0, str(Path(__file__).parent))
-    from code_analyzer import CodeAnalyzer
+    from code_analyzer import CodeAnalyzer, json_dumps, json_loads, load_task
+
+
+# 预编译的固定模式
+# 里程碑行格式：**里程碑 M1**: ...
+_MILESTONE_RE = re.compile(r'\*\*里程碑 [MN]\d+\*\*:')
+# 下一个阶段标题
+_NEXT_PHASE_RE = re.compile(r'^##+ ', re.MULTILINE)
 
 
 class TaskDocumenter:
@@ -48,6 +56,11 @@ class TaskDocumenter:
         self.spec_path = self.project_root / spec_path
         self.index_path = self.project_root / "specs" / "task_index.json"
         self.code_analyzer = CodeAnalyzer(project_root)
+        # 按阶段缓存编译好的阶段标题模式
+        self._phase_re_cache: Dict[str, re.Pattern] = {}
+        # 规格文档内容缓存：整批任务只读一次、写一次
+        self._spec_content: Optional[str] = None
+        self._dirty = False
 
     def document_task(self, task: Dict, dry_run: bool = False) -> bool:
         """记录任务完成
@@ -91,6 +104,29 @@ class TaskDocumenter:
         print(f"✅ 任务完成记录已添加到 {self.spec_path}")
         return True
 
+    def _load_spec(self) -> Optional[str]:
+        """读取并缓存规格文档内容
+
+        Returns:
+            文档内容，文件不存在时返回 None
+        """
+        if self._spec_content is None and self.spec_path.exists():
+            self._spec_content = self.spec_path.read_text(encoding="utf-8")
+        return self._spec_content
+
+    def flush(self) -> bool:
+        """将缓存中的修改一次性写回磁盘
+
+        Returns:
+            是否执行了写入
+        """
+        if not self._dirty or self._spec_content is None:
+            return False
+        # 预先编码为字节，避免 write_text 再走一次编码
+        self.spec_path.write_bytes(self._spec_content.encode("utf-8"))
+        self._dirty = False
+        return True
+
     def _collect_implementation_info(self, task: Dict) -> Dict[str, Any]:
         """收集实现信息
 
@@ -118,26 +154,30 @@ class TaskDocumenter:
             if test_file and (self.project_root / test_file).exists():
                 file_paths.append(test_file)
 
-        # 筛选实际存在的 Python 文件
+        # 筛选实际存在的 Python 文件（每个文件只 stat 一次，结果复用给分析器）
+        stats = []
         for file_path in file_paths:
+            if not file_path.endswith('.py'):
+                continue
             full_path = self.project_root / file_path
-            if full_path.exists() and file_path.endswith('.py'):
-                impl_info["created_files"].append(file_path)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            impl_info["created_files"].append(file_path)
+            stats.append((full_path, st))
 
         # 2. 分析代码结构
         print(f"   分析 {len(impl_info['created_files'])} 个文件...")
-        for file_path in impl_info["created_files"]:
-            full_path = self.project_root / file_path
-            if full_path.exists():
-                analysis = self.code_analyzer.analyze_file(str(full_path))
-                if "error" not in analysis:
-                    impl_info["classes_and_functions"].append(analysis)
+        for full_path, st in stats:
+            analysis = self.code_analyzer.analyze_file(str(full_path), st=st)
+            if "error" not in analysis:
+                impl_info["classes_and_functions"].append(analysis)
 
         # 3. 读取测试报告
         test_report_path = self.project_root / "specs" / f"test_report_{task['id']}.json"
         if test_report_path.exists():
-            with open(test_report_path, "r", encoding="utf-8") as f:
-                impl_info["test_results"] = json.load(f)
+            impl_info["test_results"] = json_loads(test_report_path.read_bytes())
 
         return impl_info
 
@@ -190,15 +230,15 @@ class TaskDocumenter:
                     if cls["methods"]:
                         lines.append('    * 方法:')
                         for method in cls["methods"]:
-                            args = ", ".join(method["args"])
-                            returns = f" -> {method['returns']}" if method['returns'] else ""
-                            lines.append(f'      * `{method["name"]}({args}){returns}`')
+                            args = ", ".join(method.args)
+                            returns = f" -> {method.returns}" if method.returns else ""
+                            lines.append(f'      * `{method.name}({args}){returns}`')
 
                 # 顶层函数
                 for func in analysis.get("functions", []):
-                    args = ", ".join(func["args"])
-                    returns = f" -> {func['returns']}" if func['returns'] else ""
-                    lines.append(f'  * **函数**: `{func["name"]}({args}){returns}`')
+                    args = ", ".join(func.args)
+                    returns = f" -> {func.returns}" if func.returns else ""
+                    lines.append(f'  * **函数**: `{func.name}({args}){returns}`')
 
                 lines.append('')
 
@@ -268,18 +308,17 @@ class TaskDocumenter:
         """
         # 检查 task_index.json
         if self.index_path.exists():
-            with open(self.index_path, "r", encoding="utf-8") as f:
-                index = json.load(f)
+            index = json_loads(self.index_path.read_bytes())
 
             for t in index.get("tasks", []):
                 if t.get("id") == task["id"] and t.get("documented"):
                     return True
 
-        # 检查 devspec.md 中是否已有记录
-        if self.spec_path.exists():
-            content = self.spec_path.read_text(encoding="utf-8")
-            pattern = f'<summary>✅ {re.escape(task["title"])} - 完成详情</summary>'
-            if re.search(pattern, content):
+        # 检查 devspec.md 中是否已有记录（固定字符串，无需正则）
+        content = self._load_spec()
+        if content is not None:
+            marker = f'<summary>✅ {task["title"]} - 完成详情</summary>'
+            if marker in content:
                 return True
 
         return False
@@ -294,12 +333,11 @@ class TaskDocumenter:
         Returns:
             是否成功
         """
-        if not self.spec_path.exists():
+        content = self._load_spec()
+        if content is None:
             print(f"❌ 规格文档不存在: {self.spec_path}")
             return False
 
-        content = self.spec_path.read_text(encoding="utf-8")
-
         # 查找插入位置
         insertion_point = self._find_insertion_point(content, task)
 
@@ -315,8 +353,9 @@ class TaskDocumenter:
                 content[insertion_point:]
             )
 
-        # 写回文件
-        self.spec_path.write_text(new_content, encoding="utf-8")
+        # 只更新缓存，由 flush() 统一写回
+        self._spec_content = new_content
+        self._dirty = True
         return True
 
     def _find_insertion_point(self, content: str, task: Dict) -> Optional[int]:
@@ -334,31 +373,29 @@ class TaskDocumenter:
         # 获取任务的阶段
         phase = task.get("phase", "")
 
-        # 查找阶段标题
-        phase_pattern = rf'^##+ {re.escape(phase)}.*?$'
-        phase_match = re.search(phase_pattern, content, re.MULTILINE)
+        # 查找阶段标题（按阶段缓存编译结果）
+        phase_re = self._phase_re_cache.get(phase)
+        if phase_re is None:
+            phase_re = re.compile(rf'^##+ {re.escape(phase)}.*?$', re.MULTILINE)
+            self._phase_re_cache[phase] = phase_re
 
+        phase_match = phase_re.search(content)
         if not phase_match:
             return None
 
         phase_start = phase_match.end()
 
-        # 从阶段开始位置查找里程碑行
-        # 里程碑行格式：**里程碑 M1**: ...
-        milestone_pattern = r'\*\*里程碑 [MN]\d+\*\*:'
-
-        # 在阶段内容中查找里程碑
-        milestone_match = re.search(milestone_pattern, content[phase_start:], re.MULTILINE)
+        # 在阶段内容中查找里程碑（用 pos 参数避免切片拷贝）
+        milestone_match = _MILESTONE_RE.search(content, phase_start)
 
         if milestone_match:
-            return phase_start + milestone_match.start()
+            return milestone_match.start()
 
         # 如果没有里程碑，查找下一个阶段标题
-        next_phase_pattern = r'^##+ '
-        next_phase_match = re.search(next_phase_pattern, content[phase_start:], re.MULTILINE)
+        next_phase_match = _NEXT_PHASE_RE.search(content, phase_start)
 
         if next_phase_match:
-            return phase_start + next_phase_match.start()
+            return next_phase_match.start()
 
         # 如果都没有，返回文件末尾
         return None
@@ -376,8 +413,7 @@ class TaskDocumenter:
             print(f"⚠️  任务索引不存在: {self.index_path}")
             return False
 
-        with open(self.index_path, "r", encoding="utf-8") as f:
-            index = json.load(f)
+        index = json_loads(self.index_path.read_bytes())
 
         # 更新任务
         updated = False
@@ -393,14 +429,18 @@ class TaskDocumenter:
             return False
 
         # 写回文件
-        with open(self.index_path, "w", encoding="utf-8") as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        self.index_path.write_bytes(json_dumps(index))
 
         return True
 
-    def _infer_test_file(self, source_file: str) -> Optional[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _infer_test_file(source_file: str) -> Optional[str]:
         """从源文件推断测试文件路径
 
+        纯函数：同一任务会在收集信息和生成记录时各查询一次，
+        结果按 source_file 记忆化。
+
         Args:
             source_file: 源文件路径
 
@@ -419,27 +459,6 @@ class TaskDocumenter:
         return f"tests/unit/test_{test_path.name}"
 
 
-def load_task(task_input: str) -> Dict:
-    """加载任务数据
-
-    Args:
-        task_input: 任务 JSON 字符串或包含 JSON 的文件路径
-
-    Returns:
-        任务字典
-    """
-    task_path = Path(task_input)
-    if task_path.exists():
-        with open(task_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    try:
-        return json.loads(task_input)
-    except json.JSONDecodeError:
-        print(f"❌ 错误：无法解析任务数据: {task_input}")
-        sys.exit(1)
-
-
 def main():
     parser = argparse.ArgumentParser(
         description="任务完成记录工具 - 向 devspec.md 添加完成详情"
@@ -462,6 +481,9 @@ def main():
     documenter = TaskDocumenter(args.project_root, args.spec)
     success = documenter.document_task(task, dry_run=args.dry_run)
 
+    # 统一写回缓存的规格文档修改
+    documenter.flush()
+
     return 0 if success else 1
 
 
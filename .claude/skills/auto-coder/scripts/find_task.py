@@ -25,6 +25,11 @@ class TaskFinder:
     def __init__(self, index_path: str):
         self.index_path = Path(index_path)
         self.index: Dict = {}
+        # id -> task 索引，加载后构建，使按 ID 查找为 O(1)
+        self._by_id: Dict[str, Dict] = {}
+        # 依赖判定索引：id -> 依赖集合，以及已完成任务集合
+        self._deps: Dict[str, set] = {}
+        self._completed: set = set()
 
     def load_index(self) -> bool:
         """加载任务索引"""
@@ -36,14 +41,16 @@ class TaskFinder:
         with open(self.index_path, "r", encoding="utf-8") as f:
             self.index = json.load(f)
 
+        tasks = self.index["tasks"]
+        self._by_id = {t["id"]: t for t in tasks}
+        self._deps = {t["id"]: set(t.get("dependencies", [])) for t in tasks}
+        self._completed = {t["id"] for t in tasks if t["status"] == "completed"}
+
         return True
 
     def find_by_id(self, task_id: str) -> Optional[Dict]:
         """根据 ID 查找任务"""
-        for task in self.index["tasks"]:
-            if task["id"] == task_id:
-                return task
-        return None
+        return self._by_id.get(task_id)
 
     def find_next(self) -> Optional[Dict]:
         """查找下一个待执行任务
@@ -68,30 +75,34 @@ class TaskFinder:
 
         return None
 
+    def mark_completed(self, task_id: str):
+        """标记任务完成，保持依赖判定索引同步"""
+        task = self._by_id.get(task_id)
+        if task:
+            task["status"] = "completed"
+        self._completed.add(task_id)
+
     def _check_dependencies(self, task: Dict) -> bool:
         """检查任务依赖是否满足"""
-        deps = task.get("dependencies", [])
+        deps = self._deps.get(task["id"])
         if not deps:
             return True
 
-        for dep_id in deps:
-            dep_task = self.find_by_id(dep_id)
-            if not dep_task:
+        missing = deps.difference(self._by_id)
+        if missing:
+            for dep_id in sorted(missing):
                 print(f"⚠️  警告：依赖任务 {dep_id} 不存在")
-                return False
-            if dep_task["status"] != "completed":
-                return False
+            return False
 
-        return True
+        return deps <= self._completed
 
     def get_blocking_tasks(self, task: Dict) -> List[Dict]:
         """获取阻塞当前任务的任务列表"""
-        blockers = []
-        for dep_id in task.get("dependencies", []):
-            dep_task = self.find_by_id(dep_id)
-            if dep_task and dep_task["status"] != "completed":
-                blockers.append(dep_task)
-        return blockers
+        return [
+            self._by_id[dep_id]
+            for dep_id in task.get("dependencies", [])
+            if dep_id in self._by_id and dep_id not in self._completed
+        ]
 
     def print_task(self, task: Dict):
         """打印任务详情"""
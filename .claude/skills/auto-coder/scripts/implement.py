@@ -14,12 +14,119 @@ Implement - 生成代码和测试文件
 """
 
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# 复用 code_analyzer 的 orjson 快速路径（不可用时自动回退标准库）
+try:
+    from code_analyzer import json_loads, load_task
+except ImportError:
+    # 如果直接运行此脚本，尝试从同一目录导入
+    sys.path.insert(0, str(Path(__file__).parent))
+    from code_analyzer import json_loads, load_task
+
+
+# 源文件模板：模块加载时物化一次，按任务用 format_map 填充，
+# 避免每个文件重新拼接大段静态骨架
+_SOURCE_TEMPLATE = '''"""{module_name} - {title}.
+
+此模块实现: {acceptance_criteria}
+"""
+
+from typing import Any, Dict, List, Optional
+from abc import ABC, abstractmethod
+
+
+class {class_name}:
+    """{class_name}.
+
+    {acceptance_criteria}
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化 {class_name}.
+
+        Args:
+            config: 配置字典，从 config/settings.yaml 加载
+        """
+        self.config = config or {{}}
+        self._validate_config()
+
+    def _validate_config(self) -> None:
+        """验证配置.
+
+        Raises:
+            ValueError: 当配置无效时
+        """
+        required_keys = []  # 根据实际需求添加
+        for key in required_keys:
+            if key not in self.config:
+                raise ValueError(f"Missing required config key: {{key}}")
+
+    def {method_name}(self, *args, **kwargs) -> {return_type}:
+        """{title}.
+
+        {acceptance_criteria}
+
+        Returns:
+            {return_type}: 返回值描述
+
+        Raises:
+            NotImplementedError: 此方法需要根据具体任务实现
+        """
+        # TODO: 根据 devspec.md 中的规范实现此方法
+        raise NotImplementedError("Method implementation pending")
+
+    def __repr__(self) -> str:
+        """字符串表示."""
+        return f"{{self.__class__.__name__}}(config={{self.config}})"
+'''
+
+# 测试文件模板
+_TEST_TEMPLATE = '''"""Tests for {module_name}."""
+
+import pytest
+from unittest.mock import Mock, patch, MagicMock
+import sys
+from pathlib import Path
+
+# 添加 src 到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+{import_statement}
+
+
+class Test{class_name}:
+    """Test {class_name}."""
+
+    @pytest.fixture
+    def config(self):
+        """测试配置."""
+        return {{
+            # 添加测试配置
+        }}
+
+    @pytest.fixture
+    def instance(self, config):
+        """创建测试实例."""
+        return {class_name}(config=config)
+
+    def test_init_success(self, instance):
+        """测试初始化成功."""
+        assert instance is not None
+        assert instance.config is not None
+
+    def test_{method_name}_not_implemented(self, instance):
+        """测试 {method_name} 尚未实现."""
+        with pytest.raises(NotImplementedError):
+            instance.{method_name}()
+
+    # TODO: 根据验收标准添加更多测试用例
+    # 参考 task['acceptance_criteria']
+'''
+
 
 class CodeGenerator:
     """代码生成器"""
@@ -175,111 +282,24 @@ class Test{class_name}:
         注意：这是一个简化版本。实际使用时，应该由 Claude AI 根据任务描述
         和技术规范生成完整的、符合业务逻辑的代码。
         """
-        # 从任务描述中提取方法信息
-        method_name = self._infer_method_name(task["title"])
-        return_type = self._infer_return_type(task["file"])
-
-        content = f'''"""{module_name} - {task['title']}.
-
-此模块实现: {task['acceptance_criteria']}
-"""
-
-from typing import Any, Dict, List, Optional
-from abc import ABC, abstractmethod
-
-
-class {class_name}:
-    """{class_name}.
-
-    {task['acceptance_criteria']}
-    """
-
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
-        """初始化 {class_name}.
-
-        Args:
-            config: 配置字典，从 config/settings.yaml 加载
-        """
-        self.config = config or {{}}
-        self._validate_config()
-
-    def _validate_config(self) -> None:
-        """验证配置.
-
-        Raises:
-            ValueError: 当配置无效时
-        """
-        required_keys = []  # 根据实际需求添加
-        for key in required_keys:
-            if key not in self.config:
-                raise ValueError(f"Missing required config key: {{key}}")
-
-    def {method_name}(self, *args, **kwargs) -> {return_type}:
-        """{task['title']}.
-
-        {task['acceptance_criteria']}
-
-        Returns:
-            {return_type}: 返回值描述
-
-        Raises:
-            NotImplementedError: 此方法需要根据具体任务实现
-        """
-        # TODO: 根据 devspec.md 中的规范实现此方法
-        raise NotImplementedError("Method implementation pending")
-
-    def __repr__(self) -> str:
-        """字符串表示."""
-        return f"{self.__class__.__name__}(config={{self.config}})"
-'''
-        return content
+        # 从任务描述中提取方法信息，填入模块级模板
+        return _SOURCE_TEMPLATE.format_map({
+            "module_name": module_name,
+            "class_name": class_name,
+            "title": task["title"],
+            "acceptance_criteria": task["acceptance_criteria"],
+            "method_name": self._infer_method_name(task["title"]),
+            "return_type": self._infer_return_type(task["file"]),
+        })
 
     def _generate_test_content(self, class_name: str, module_name: str, task: Dict) -> str:
         """生成测试内容"""
-        method_name = self._infer_method_name(task["title"])
-
-        content = f'''"""Tests for {module_name}."""
-
-import pytest
-from unittest.mock import Mock, patch, MagicMock
-import sys
-from pathlib import Path
-
-# 添加 src 到路径
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
-
-{self._get_import_statement(module_name, class_name)}
-
-
-class Test{class_name}:
-    """Test {class_name}."""
-
-    @pytest.fixture
-    def config(self):
-        """测试配置."""
-        return {{
-            # 添加测试配置
-        }}
-
-    @pytest.fixture
-    def instance(self, config):
-        """创建测试实例."""
-        return {class_name}(config=config)
-
-    def test_init_success(self, instance):
-        """测试初始化成功."""
-        assert instance is not None
-        assert instance.config is not None
-
-    def test_{method_name}_not_implemented(self, instance):
-        """测试 {method_name} 尚未实现."""
-        with pytest.raises(NotImplementedError):
-            instance.{method_name}()
-
-    # TODO: 根据验收标准添加更多测试用例
-    # 参考 task['acceptance_criteria']
-'''
-        return content
+        return _TEST_TEMPLATE.format_map({
+            "module_name": module_name,
+            "class_name": class_name,
+            "method_name": self._infer_method_name(task["title"]),
+            "import_statement": self._get_import_statement(module_name, class_name),
+        })
 
     @staticmethod
     def _infer_class_name(file_path: str) -> str:
@@ -351,29 +371,6 @@ class Test{class_name}:
                 print(f"   🗑️  删除: {file_path}")
 
 
-def load_task(task_input: str) -> Dict:
-    """加载任务数据
-
-    Args:
-        task_input: 任务 JSON 字符串或包含 JSON 的文件路径
-
-    Returns:
-        任务字典
-    """
-    # 尝试作为文件读取
-    task_path = Path(task_input)
-    if task_path.exists():
-        with open(task_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    # 尝试作为 JSON 字符串解析
-    try:
-        return json.loads(task_input)
-    except json.JSONDecodeError:
-        print(f"❌ 错误：无法解析任务数据: {task_input}")
-        sys.exit(1)
-
-
 def main():
     parser = argparse.ArgumentParser(description="生成代码和测试文件")
     parser.add_argument("--task", required=True, help="任务 JSON（字符串或文件路径）")
@@ -13,6 +13,7 @@ Persist - 更新规格文档状态并可选提交到 git
 """
 
 import argparse
+import functools
 import json
 import os
 import re
@@ -20,7 +21,62 @@ import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+# 复用 code_analyzer 的 orjson 快速路径（不可用时自动回退标准库）
+try:
+    from code_analyzer import json_dumps, json_loads, load_task
+except ImportError:
+    # 如果直接运行此脚本，尝试从同一目录导入
+    sys.path.insert(0, str(Path(__file__).parent))
+    from code_analyzer import json_dumps, json_loads, load_task
+
+
+# 任务行模式模板
+# 匹配格式：| [checkbox] | title | file | ...
+_TASK_ROW_TEMPLATE = r'(\|\s*)\[[\]~x]\](\s*\|\s*{title}\s*\|\s*{file}\s*\|)'
+
+
+@functools.lru_cache(maxsize=512)
+def _task_row_re(title: str, file: str) -> re.Pattern:
+    """按 (title, file) 缓存编译好的任务行模式"""
+    return re.compile(
+        _TASK_ROW_TEMPLATE.format(title=re.escape(title), file=re.escape(file)),
+        re.MULTILINE
+    )
+
+
+# 阶段映射：从 phase 名称到表格中的行名
+_PHASE_MAPPING = {
+    "阶段 0: 项目基础设施 (Day 1)": "阶段0",
+    "阶段 1: Libs 层 - 可插拔抽象 (Day 2-5)": "阶段1",
+    "阶段 2: Ingestion Pipeline (Day 6-9)": "阶段2",
+    "阶段 3: Query Engine (Day 10-13)": "阶段3",
+    "阶段 4: Response & Trace (Day 14-15)": "阶段4",
+    "阶段 5: Observability 基础 (Day 16-17)": "阶段5",
+    "阶段 6: MCP Server (Day 18-20)": "阶段6",
+    "阶段 7: Dashboard (Day 21-24)": "阶段7",
+    "阶段 8: 测试与优化 (Day 25-27)": "阶段8",
+}
+
+# 原始备注映射（保留原有描述）
+_ORIGINAL_NOTES = {
+    "阶段0": "基础设施",
+    "阶段1": "Libs层",
+    "阶段2": "Ingestion",
+    "阶段3": "Query Engine",
+    "阶段4": "Response & Trace",
+    "阶段5": "Observability",
+    "阶段6": "MCP Server",
+    "阶段7": "Dashboard",
+    "阶段8": "测试与优化",
+}
+
+# 进度表格行模式，一条模式匹配所有阶段行，单次扫描完成全部替换
+# 格式：| 阶段1 | ⬜ 待开始 | - | Libs层 |
+_ALL_PHASE_ROWS_RE = re.compile(
+    r'(\|\s*)(阶段\d)(\s*\|\s*)[^\|]+(\s*\|\s*)[^\|]+(\s*\|\s*)[^\|]+(\s*\|)'
+)
 
 
 class SpecUpdater:
@@ -36,6 +92,29 @@ class SpecUpdater:
         self.project_root = Path(project_root).resolve()
         self.spec_path = self.project_root / spec_path
         self.index_path = self.project_root / "specs" / "task_index.json"
+        # 任务索引缓存及 id -> task 映射，首次访问时加载
+        self._index_cache: Optional[Dict] = None
+        self._task_by_id: Optional[Dict[str, Dict]] = None
+
+    def _load_index(self) -> Optional[Dict]:
+        """读取并缓存任务索引
+
+        同时构建 id -> task 映射，使按 ID 更新为 O(1)。
+
+        Returns:
+            任务索引字典，索引文件不存在时返回 None
+        """
+        if self._index_cache is None:
+            if not self.index_path.exists():
+                return None
+            self._index_cache = json_loads(self.index_path.read_bytes())
+            self._task_by_id = {t["id"]: t for t in self._index_cache["tasks"]}
+        return self._index_cache
+
+    def _save_index(self) -> None:
+        """将缓存的任务索引写回磁盘"""
+        self.index_path.write_bytes(json_dumps(self._index_cache))
+        print(f"   ✅ 更新: {self.index_path}")
 
     def update_task_status(self, task: Dict, new_status: str) -> bool:
         """更新任务状态
@@ -49,51 +128,114 @@ class SpecUpdater:
         """
         print(f"\n📝 更新任务状态: {task['title']} -> {new_status}")
 
-        # 1. 更新 devspec.md
-        if not self._update_spec_file(task, new_status):
+        if not self.spec_path.exists():
+            print(f"❌ 规格文档不存在: {self.spec_path}")
+            return False
+
+        # 一次读取，所有修改在内存中完成，最后一次写回，
+        # 将每个任务 2 读 2 写 devspec.md 合并为 1 读 1 写
+        content = self.spec_path.read_text(encoding="utf-8")
+
+        # 1. 更新任务行状态
+        new_content = self._apply_status(content, task, new_status)
+        if new_content is None:
+            print(f"⚠️  警告：在规格文档中未找到任务: {task['title']}")
             return False
+        content = new_content
 
         # 2. 更新 task_index.json
         if not self._update_index_file(task, new_status):
             return False
 
-        # 3. 更新进度跟踪表格
-        if not self._update_progress_table():
-            return False
+        # 3. 刷新进度跟踪表格（索引不存在时跳过）
+        index = self._load_index()
+        if index is not None:
+            content = self._apply_progress_table(content, index)
+
+        # 写回文件
+        self.spec_path.write_text(content, encoding="utf-8")
+        print(f"   ✅ 更新: {self.spec_path}")
 
         print(f"✅ 任务状态已更新")
         return True
 
-    def _update_spec_file(self, task: Dict, new_status: str) -> bool:
-        """更新规格文档中的任务状态"""
+    def update_many(self, updates: List[Tuple[Dict, str]]) -> bool:
+        """批量更新任务状态
+
+        整批只读写一次 devspec.md 和 task_index.json：读入内存后
+        逐个应用状态替换，最后统一刷新进度表格并各写回一次，
+        将 N 个任务的持久化 I/O 从 O(N·文件大小) 摊薄为一次读写。
+
+        Args:
+            updates: (任务字典, 新状态) 列表
+
+        Returns:
+            是否全部更新成功
+        """
+        if not updates:
+            return True
+
         if not self.spec_path.exists():
             print(f"❌ 规格文档不存在: {self.spec_path}")
             return False
 
         content = self.spec_path.read_text(encoding="utf-8")
+
+        index = self._load_index()
+
+        ok = True
+        for task, new_status in updates:
+            print(f"\n📝 更新任务状态: {task['title']} -> {new_status}")
+
+            new_content = self._apply_status(content, task, new_status)
+            if new_content is None:
+                print(f"⚠️  警告：在规格文档中未找到任务: {task['title']}")
+                ok = False
+                continue
+            content = new_content
+
+            if index is not None:
+                t = self._task_by_id.get(task["id"])
+                if t is not None:
+                    t["status"] = new_status
+
+        # 统计和进度表格整批只重算一次
+        if index is not None:
+            index["completed"] = sum(1 for t in index["tasks"] if t["status"] == "completed")
+            index["in_progress"] = sum(1 for t in index["tasks"] if t["status"] == "in_progress")
+            index["pending"] = sum(1 for t in index["tasks"] if t["status"] == "pending")
+            content = self._apply_progress_table(content, index)
+
+            self._save_index()
+
+        self.spec_path.write_text(content, encoding="utf-8")
+        print(f"   ✅ 更新: {self.spec_path}")
+
+        return ok
+
+    def _apply_status(self, content: str, task: Dict, new_status: str) -> Optional[str]:
+        """在内存中替换任务行的 checkbox 状态
+
+        Args:
+            content: 规格文档内容
+            task: 任务字典
+            new_status: 新状态
+
+        Returns:
+            替换后的内容，未找到任务行时返回 None
+        """
         new_checkbox = self.STATUS_MAP.get(new_status, "[ ]")
 
-        # 查找并替换任务行
-        # 匹配格式：| [checkbox] | title | file | ...
-        pattern = re.compile(
-            rf'(\|\s*)\[[\]~x]\](\s*\|\s*{re.escape(task["title"])}\s*\|\s*{re.escape(task["file"])}\s*\|)',
-            re.MULTILINE
-        )
+        # 查找并替换任务行（编译结果按任务缓存）
+        pattern = _task_row_re(task["title"], task["file"])
 
         match = pattern.search(content)
         if not match:
-            print(f"⚠️  警告：在规格文档中未找到任务: {task['title']}")
-            return False
+            return None
 
         # 替换状态
         new_line = match.group(1) + new_checkbox + match.group(2)
-        content = pattern.sub(new_line, content, count=1)
-
-        # 写回文件
-        self.spec_path.write_text(content, encoding="utf-8")
-        print(f"   ✅ 更新: {self.spec_path}")
-
-        return True
+        return pattern.sub(new_line, content, count=1)
 
     def _update_index_file(self, task: Dict, new_status: str) -> bool:
         """更新任务索引文件"""
@@ -101,42 +243,33 @@ class SpecUpdater:
             print(f"⚠️  警告：任务索引不存在: {self.index_path}")
             return False
 
-        with open(self.index_path, "r", encoding="utf-8") as f:
-            index = json.load(f)
+        index = self._load_index()
 
-        # 更新任务状态
-        for t in index["tasks"]:
-            if t["id"] == task["id"]:
-                t["status"] = new_status
-                break
+        # 更新任务状态（O(1) 字典查找）
+        t = self._task_by_id.get(task["id"])
+        if t is not None:
+            old_status = t["status"]
+            t["status"] = new_status
 
-        # 更新统计
-        index["completed"] = sum(1 for t in index["tasks"] if t["status"] == "completed")
-        index["in_progress"] = sum(1 for t in index["tasks"] if t["status"] == "in_progress")
-        index["pending"] = sum(1 for t in index["tasks"] if t["status"] == "pending")
+            # 增量维护统计，避免三次全表扫描
+            if old_status != new_status:
+                index[old_status] -= 1
+                index[new_status] += 1
 
         # 写回文件
-        with open(self.index_path, "w", encoding="utf-8") as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
-
-        print(f"   ✅ 更新: {self.index_path}")
+        self._save_index()
         return True
 
-    def _update_progress_table(self) -> bool:
-        """更新进度跟踪表格
+    def _apply_progress_table(self, content: str, index: Dict) -> str:
+        """在内存中根据任务索引刷新进度跟踪表格
 
-        根据各阶段任务完成情况，更新进度跟踪表格中的状态。
+        Args:
+            content: 规格文档内容
+            index: 任务索引字典
 
         Returns:
-            是否更新成功
+            更新后的内容
         """
-        if not self.index_path.exists():
-            return True  # 如果索引不存在，跳过
-
-        # 读取任务索引
-        with open(self.index_path, "r", encoding="utf-8") as f:
-            index = json.load(f)
-
         # 按阶段统计任务
         phase_stats: Dict[str, Dict[str, int]] = {}
         for task in index["tasks"]:
@@ -149,44 +282,17 @@ class SpecUpdater:
             elif task["status"] == "in_progress":
                 phase_stats[phase]["in_progress"] += 1
 
-        # 读取 spec 文件
-        content = self.spec_path.read_text(encoding="utf-8")
-
         # 更新进度跟踪表格
         today = datetime.now().strftime("%Y-%m-%d")
 
-        # 阶段映射：从 phase 名称到表格中的行名
-        phase_mapping = {
-            "阶段 0: 项目基础设施 (Day 1)": "阶段0",
-            "阶段 1: Libs 层 - 可插拔抽象 (Day 2-5)": "阶段1",
-            "阶段 2: Ingestion Pipeline (Day 6-9)": "阶段2",
-            "阶段 3: Query Engine (Day 10-13)": "阶段3",
-            "阶段 4: Response & Trace (Day 14-15)": "阶段4",
-            "阶段 5: Observability 基础 (Day 16-17)": "阶段5",
-            "阶段 6: MCP Server (Day 18-20)": "阶段6",
-            "阶段 7: Dashboard (Day 21-24)": "阶段7",
-            "阶段 8: 测试与优化 (Day 25-27)": "阶段8",
-        }
-
-        # 原始备注映射（保留原有描述）
-        original_notes = {
-            "阶段0": "基础设施",
-            "阶段1": "Libs层",
-            "阶段2": "Ingestion",
-            "阶段3": "Query Engine",
-            "阶段4": "Response & Trace",
-            "阶段5": "Observability",
-            "阶段6": "MCP Server",
-            "阶段7": "Dashboard",
-            "阶段8": "测试与优化",
-        }
-
-        for phase_full, phase_short in phase_mapping.items():
+        # 预计算每个阶段行的 (状态, 日期, 备注)
+        phase_state: Dict[str, tuple] = {}
+        for phase_full, phase_short in _PHASE_MAPPING.items():
             if phase_full not in phase_stats:
                 continue
 
             stats = phase_stats[phase_full]
-            original_note = original_notes.get(phase_short, "")
+            original_note = _ORIGINAL_NOTES.get(phase_short, "")
 
             # 确定状态
             if stats["completed"] == stats["total"]:
@@ -207,23 +313,30 @@ class SpecUpdater:
             else:
                 note = original_note
 
-            # 匹配并替换表格行
-            # 格式：| 阶段1 | ⬜ 待开始 | - | Libs层 |
-            pattern = re.compile(
-                rf'(\|\s*{re.escape(phase_short)}\s*\|\s*)[^\|]+(\s*\|\s*)[^\|]+(\s*\|\s*)[^\|]+(\s*\|)'
+            phase_state[phase_short] = (status, date, note)
+
+        # 单次扫描替换所有阶段行，按行名分发
+        updated: List[tuple] = []
+
+        def _render_row(match: re.Match) -> str:
+            state = phase_state.get(match.group(2))
+            if state is None:
+                return match.group(0)
+            status, date, note = state
+            new_row = (
+                f"{match.group(1)}{match.group(2)}{match.group(3)}{status}"
+                f"{match.group(4)}{date}{match.group(5)}{note}{match.group(6)}"
             )
+            if new_row != match.group(0):
+                updated.append((match.group(2), status))
+            return new_row
 
-            def replacement(match):
-                return f"{match.group(1)}{status}{match.group(2)}{date}{match.group(3)}{note}{match.group(4)}"
+        content = _ALL_PHASE_ROWS_RE.sub(_render_row, content)
 
-            new_content = pattern.sub(replacement, content)
-            if new_content != content:
-                content = new_content
-                print(f"   ✅ 更新进度: {phase_short} -> {status}")
+        for phase_short, status in updated:
+            print(f"   ✅ 更新进度: {phase_short} -> {status}")
 
-        # 写回文件
-        self.spec_path.write_text(content, encoding="utf-8")
-        return True
+        return content
 
 
 class GitCommitter:
@@ -231,6 +344,9 @@ class GitCommitter:
 
     def __init__(self, project_root: str):
         self.project_root = Path(project_root).resolve()
+        # 构造时检测一次并缓存；.git 在 worktree 中是文件而非目录
+        git_path = os.path.join(str(self.project_root), ".git")
+        self._git_repo = os.path.isdir(git_path) or os.path.isfile(git_path)
 
     def commit_task(self, task: Dict, files: Optional[list] = None) -> bool:
         """创建 git commit
@@ -255,8 +371,7 @@ class GitCommitter:
 
         # 添加文件
         if files:
-            for file in files:
-                self._git_add(file)
+            self._git_add_files(files)
         else:
             self._git_add_all()
 
@@ -270,22 +385,25 @@ class GitCommitter:
         return result
 
     def _is_git_repo(self) -> bool:
-        """检查是否在 git 仓库中"""
-        git_dir = self.project_root / ".git"
-        return git_dir.exists()
+        """检查是否在 git 仓库中（结果在构造时缓存）"""
+        return self._git_repo
 
-    def _git_add(self, file_path: str):
-        """添加单个文件到 git"""
+    def _git_add_files(self, files: list):
+        """批量添加文件到 git
+
+        整个列表一次传给 git add，避免每个文件 fork 一个子进程。
+        """
         result = subprocess.run(
-            ["git", "add", file_path],
+            ["git", "add", "--", *files],
             cwd=self.project_root,
             capture_output=True,
             text=True
         )
         if result.returncode == 0:
-            print(f"   ➕ 添加: {file_path}")
+            for file_path in files:
+                print(f"   ➕ 添加: {file_path}")
         else:
-            print(f"   ⚠️  添加失败: {file_path}")
+            print(f"   ⚠️  添加失败: {', '.join(files)}")
 
     def _git_add_all(self):
         """添加所有更改到 git"""
@@ -331,19 +449,6 @@ class GitCommitter:
         return f"feat({module}): {description}"
 
 
-def load_task(task_input: str) -> Dict:
-    """加载任务数据"""
-    task_path = Path(task_input)
-    if task_path.exists():
-        with open(task_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    try:
-        return json.loads(task_input)
-    except json.JSONDecodeError:
-        print(f"❌ 错误：无法解析任务数据: {task_input}")
-        sys.exit(1)
-
-
 def prompt_next_action() -> str:
     """提示用户下一步操作"""
     print("\n" + "="*50)
@@ -12,15 +12,44 @@ Sync Spec - 解析规格文档并生成任务索引
 """
 
 import argparse
-import json
+import functools
 import re
 import os
+import sys
+from collections import Counter
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import List, Optional, Dict
 
+# JSON 序列化复用 code_analyzer 的 orjson 快速路径（不可用时回退标准库）
+try:
+    from code_analyzer import json_dumps
+except ImportError:
+    # 如果直接运行此脚本，尝试从同一目录导入
+    sys.path.insert(0, str(Path(__file__).parent))
+    from code_analyzer import json_dumps
 
-@dataclass
+
+@functools.lru_cache(maxsize=256)
+def _infer_dependencies(file_path: str) -> tuple:
+    """根据文件路径推断依赖关系
+
+    同一文件路径前缀在大量任务间重复出现，按路径缓存共享结果。
+
+    Returns:
+        依赖任务 ID 元组
+    """
+    # 简单的依赖推断：根据文件路径的层次结构
+    # 例如：src/core/query_engine/xxx.py 依赖 src/core/types.py
+    if "query_engine" in file_path:
+        return ("task-001",)  # 假设 types.py 是 task-001
+    if "ingestion" in file_path:
+        return ("task-001", "task-002")  # 依赖 libs 层
+    return ()
+
+
+# slots 去掉每实例 __dict__（约 100 字节），大规格下任务成百上千条
+@dataclass(slots=True)
 class Task:
     """任务数据结构"""
     id: str
@@ -33,19 +62,6 @@ class Task:
     acceptance_criteria: str = ""
     estimated_hours: int = 0
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "title": self.title,
-            "file": self.file,
-            "status": self.status,
-            "phase": self.phase,
-            "dependencies": self.dependencies,
-            "description": self.description,
-            "acceptance_criteria": self.acceptance_criteria,
-            "estimated_hours": self.estimated_hours
-        }
-
 
 class SpecParser:
     """规格文档解析器"""
@@ -66,6 +82,25 @@ class SpecParser:
     # 章节标题模式
     SECTION_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
 
+    # 文件名 slug 模式（保留中文与单词字符）
+    SLUG_PATTERN = re.compile(r'[^\w\u4e00-\u9fff]+')
+
+    # 拆分章节用的一二级标题模式（(?!#) 排除更深层级）
+    SPLIT_HEADER_PATTERN = re.compile(r'^#{1,2}(?!#)[ \t]+(.+)$', re.MULTILINE)
+
+    # 章节标题与任务行的合并模式：整个文档一次 C 级扫描，
+    # 取代逐行 split + 两次 match 的 Python 循环。
+    # 任务分支用 [^|\n] 和 [ \t] 而非 [^|] 和 \s，保证不跨行匹配
+    COMBINED_PATTERN = re.compile(
+        r'^(?:'
+        r'(?P<level>#{1,6})[ \t]+(?P<section>.+)'
+        r'|'
+        r'\|[ \t]*(?P<checkbox>\[.\])[ \t]*\|[ \t]*(?P<title>[^|\n]+)\|[ \t]*(?P<file>[^|\n]+)'
+        r'\|[ \t]*(?P<hours>[^|\n]+)\|[ \t]*(?P<acceptance>[^|\n]+)\|'
+        r')',
+        re.MULTILINE
+    )
+
     def __init__(self, spec_path: str):
         self.spec_path = Path(spec_path)
         self.content = ""
@@ -73,6 +108,8 @@ class SpecParser:
         self.current_phase = ""
         self.current_section = ""
         self.task_counter = 0
+        # parse() 顺带记录的一二级标题偏移，供 split_sections 复用
+        self._section_offsets: Optional[List[tuple]] = None
 
     def load(self) -> bool:
         """加载规格文档"""
@@ -83,44 +120,41 @@ class SpecParser:
         return True
 
     def parse(self) -> List[Task]:
-        """解析规格文档，提取所有任务"""
-        lines = self.content.split("\n")
-
-        in_table = False
-        table_headers = []
-
-        for line in lines:
-            # 检测章节标题
-            section_match = self.SECTION_PATTERN.match(line)
-            if section_match:
-                self.current_section = section_match.group(2)
+        """解析规格文档，提取所有任务
+
+        用一条合并模式对全文做单次扫描：章节标题更新当前阶段，
+        任务行直接转换为 Task。表头/分隔行首列不是 checkbox，
+        不会被任务分支匹配，无需表格状态机。
+        """
+        self._section_offsets = []
+
+        for match in self.COMBINED_PATTERN.finditer(self.content):
+            # 章节标题分支
+            section = match.group("section")
+            if section is not None:
+                self.current_section = section
                 # 更新 phase（用于阶段 0-8）
-                if "阶段" in self.current_section or "阶段" in line:
-                    self.current_phase = self.current_section
+                if "阶段" in section:
+                    self.current_phase = section
+                # 顺带记录一二级标题位置，split_sections 无需再扫一遍
+                if len(match.group("level")) <= 2:
+                    self._section_offsets.append((match.start(), section))
                 continue
 
-            # 检测表格开始/结束
-            if line.strip().startswith("|") and line.strip().endswith("|"):
-                if not in_table:
-                    in_table = True
-                    # 下一行是分隔符，跳过
-                    continue
-                # 解析任务行
-                task = self._parse_task_line(line)
-                if task:
-                    self.tasks.append(task)
-            else:
-                in_table = False
+            # 任务行分支
+            task = self._parse_task_match(match)
+            if task:
+                self.tasks.append(task)
 
         return self.tasks
 
-    def _parse_task_line(self, line: str) -> Optional[Task]:
-        """解析单行任务"""
-        match = self.TASK_PATTERN.match(line)
-        if not match:
-            return None
-
-        checkbox, title, file_path, hours, acceptance = match.groups()
+    def _parse_task_match(self, match: re.Match) -> Optional[Task]:
+        """由合并模式的匹配结果构造任务"""
+        checkbox = match.group("checkbox")
+        title = match.group("title")
+        file_path = match.group("file")
+        hours = match.group("hours")
+        acceptance = match.group("acceptance")
 
         # 跳过标题行
         if "任务" in title and "文件" in file_path:
@@ -134,7 +168,7 @@ class SpecParser:
         task_id = f"task-{self.task_counter:03d}"
 
         # 解析依赖（从描述或当前阶段推断）
-        dependencies = self._infer_dependencies(title, file_path)
+        dependencies = list(_infer_dependencies(file_path))
 
         return Task(
             id=task_id,
@@ -147,35 +181,26 @@ class SpecParser:
             estimated_hours=int(hours.strip()) if hours.strip().isdigit() else 0
         )
 
-    def _infer_dependencies(self, title: str, file_path: str) -> List[str]:
-        """根据文件路径推断依赖关系"""
-        # 简单的依赖推断：根据文件路径的层次结构
-        deps = []
-
-        # 例如：src/core/query_engine/xxx.py 依赖 src/core/types.py
-        if "query_engine" in file_path:
-            deps = ["task-001"]  # 假设 types.py 是 task-001
-        elif "ingestion" in file_path:
-            deps = ["task-001", "task-002"]  # 依赖 libs 层
-
-        return deps
-
     def save_index(self, output_path: str) -> bool:
         """保存任务索引"""
         output_file = Path(output_path) / "task_index.json"
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # 状态统计单次遍历完成
+        counts = Counter(t.status for t in self.tasks)
+
         index = {
             "spec_file": str(self.spec_path),
             "total_tasks": len(self.tasks),
-            "completed": sum(1 for t in self.tasks if t.status == "completed"),
-            "in_progress": sum(1 for t in self.tasks if t.status == "in_progress"),
-            "pending": sum(1 for t in self.tasks if t.status == "pending"),
-            "tasks": [t.to_dict() for t in self.tasks]
+            "completed": counts.get("completed", 0),
+            "in_progress": counts.get("in_progress", 0),
+            "pending": counts.get("pending", 0),
+            # Task 对象直接交给编码器，省去整份 to_dict 中间拷贝
+            "tasks": self.tasks
         }
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        # orjson 走 C 级编码器（indent=2 是标准库最慢的路径），一次写出字节
+        output_file.write_bytes(json_dumps(index, default=asdict))
 
         print(f"✅ 任务索引已生成: {output_file}")
         print(f"   总任务数: {index['total_tasks']}")
@@ -186,53 +211,53 @@ class SpecParser:
         return True
 
     def split_sections(self, output_dir: str) -> bool:
-        """按章节拆分规格文档"""
+        """按章节拆分规格文档
+
+        用标题偏移量把原文切成区间，每个章节直接写出原文切片，
+        不再逐行累积列表再 join 重建字符串。
+        """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        lines = self.content.split("\n")
-        current_section_lines = []
+        # 优先复用 parse() 记录的标题偏移，避免第二次全文扫描
+        offsets = self._section_offsets
+        if offsets is None:
+            offsets = [
+                (m.start(), m.group(1))
+                for m in self.SPLIT_HEADER_PATTERN.finditer(self.content)
+            ]
+
         section_number = 0
-        current_file = None
-
-        for line in lines:
-            section_match = self.SECTION_PATTERN.match(line)
-            if section_match:
-                level = len(section_match.group(1))
-                title = section_match.group(2)
-
-                # 一级或二级章节
-                if level <= 2 and current_section_lines:
-                    # 保存上一章节
-                    if current_file:
-                        self._save_section(current_file, current_section_lines)
-
-                    section_number += 1
-                    current_file = output_path / f"{section_number:02d}-{self._slugify(title)}.md"
-                    current_section_lines = [line]
-                else:
-                    current_section_lines.append(line)
-            else:
-                current_section_lines.append(line)
+        current_file: Optional[Path] = None
+        span_start = 0
+
+        for start, title in offsets:
+            # 与旧逻辑一致：位于文档开头的标题并入后续内容
+            if start == 0:
+                continue
+
+            if current_file:
+                # 区间止于标题前的换行符
+                current_file.write_text(
+                    self.content[span_start:start - 1], encoding="utf-8"
+                )
+
+            section_number += 1
+            current_file = output_path / f"{section_number:02d}-{self._slugify(title)}.md"
+            span_start = start
 
         # 保存最后一章
-        if current_file and current_section_lines:
-            self._save_section(current_file, current_section_lines)
+        if current_file:
+            current_file.write_text(self.content[span_start:], encoding="utf-8")
 
         print(f"✅ 已拆分 {section_number} 个章节到: {output_dir}")
         return True
 
-    def _save_section(self, file_path: Path, lines: List[str]):
-        """保存章节内容"""
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
-
-    @staticmethod
-    def _slugify(text: str) -> str:
+    @classmethod
+    def _slugify(cls, text: str) -> str:
         """将文本转换为文件名友好的格式"""
-        # 转小写，替换空格和特殊字符为连字符
-        slug = re.sub(r'[^\w\u4e00-\u9fff]+', '-', text.lower())
-        return slug.strip('-')
+        # 转小写，替换空格和特殊字符为连字符（模式在类级编译一次）
+        return cls.SLUG_PATTERN.sub('-', text.lower()).strip('-')
 
 
 def main():
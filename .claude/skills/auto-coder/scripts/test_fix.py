@@ -14,18 +14,33 @@ Test & Fix - 执行测试并自动修复
 """
 
 import argparse
-import json
 import os
 import re
 import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 
+# 任务加载与 JSON 序列化复用 code_analyzer 的共享实现
+try:
+    from code_analyzer import json_dumps, load_task
+except ImportError:
+    # 如果直接运行此脚本，尝试从同一目录导入
+    sys.path.insert(0, str(Path(__file__).parent))
+    from code_analyzer import json_dumps, load_task
 
-@dataclass
+
+# pytest 摘要计数模式：一条交替模式覆盖三类计数（模块级编译一次）
+_SUMMARY_RE = re.compile(r'(\d+) (passed|failed|error)')
+
+# 错误行模式：行首 FAILED 或任意位置的断言/错误标记
+_ERROR_LINE_RE = re.compile(r'^\s*FAILED|AssertionError|Error:')
+
+
+# slots 去掉每实例 __dict__，多轮重试时逐轮累积的结果对象更紧凑
+@dataclass(slots=True)
 class TestResult:
     """测试结果"""
     round: int
@@ -37,18 +52,6 @@ class TestResult:
     fix_attempts: List[str] = field(default_factory=list)
     timestamp: str = ""
 
-    def to_dict(self) -> dict:
-        return {
-            "round": self.round,
-            "success": self.success,
-            "total": self.total,
-            "passed": self.passed,
-            "failed": self.failed,
-            "errors": self.errors,
-            "fix_attempts": self.fix_attempts,
-            "timestamp": self.timestamp
-        }
-
 
 class TestRunner:
     """测试运行器"""
@@ -102,24 +105,22 @@ class TestRunner:
         return False
 
     def _run_single_round(self, test_file: Path, round_num: int) -> TestResult:
-        """运行单轮测试"""
+        """运行单轮测试
+
+        流式逐行消费 pytest 输出：计数和错误行在产生时即解析，
+        不再把整份输出缓冲进内存后再做两遍全文扫描。
+        """
         # 激活 venv 并运行 pytest
         pytest_cmd = self._get_pytest_command(test_file)
 
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 pytest_cmd,
                 cwd=self.project_root,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=60
-            )
-        except subprocess.TimeoutExpired:
-            print(f"⏱️  测试超时")
-            return TestResult(
-                round=round_num,
-                success=False,
-                errors=["Test execution timeout"]
+                bufsize=1
             )
         except FileNotFoundError:
             print(f"❌ pytest 未找到，请确保 venv 已正确配置")
@@ -129,49 +130,33 @@ class TestRunner:
                 errors=["pytest not found"]
             )
 
-        # 解析测试结果
-        return self._parse_test_output(result, round_num)
-
-    def _get_pytest_command(self, test_file: Path) -> List[str]:
-        """获取 pytest 命令"""
-        # 在 venv 中运行 pytest
-        if os.name == "nt":  # Windows
-            pytest_bin = self.venv_path / "Scripts" / "pytest.exe"
-        else:  # Unix-like
-            pytest_bin = self.venv_path / "bin" / "pytest"
-
-        return [
-            str(pytest_bin),
-            str(test_file.relative_to(self.project_root)),
-            "-v",
-            "--tb=short",
-            "--color=yes"
-        ]
+        counts: Dict[str, Optional[int]] = {"passed": None, "failed": None, "error": None}
+        errors: List[str] = []
 
-    def _parse_test_output(self, result: subprocess.CompletedProcess, round_num: int) -> TestResult:
-        """解析 pytest 输出"""
-        output = result.stdout + result.stderr
-
-        # 解析测试数量
-        total_match = re.search(r'(\d+) passed', output)
-        failed_match = re.search(r'(\d+) failed', output)
-        error_match = re.search(r'(\d+) error', output)
-
-        total = 0
-        passed = int(total_match.group(1)) if total_match else 0
-        failed = int(failed_match.group(1)) if failed_match else 0
-        errors_count = int(error_match.group(1)) if error_match else 0
+        try:
+            for line in proc.stdout:
+                self._parse_output_line(line, counts, errors)
+            returncode = proc.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            proc.terminate()
+            proc.wait()
+            print(f"⏱️  测试超时")
+            return TestResult(
+                round=round_num,
+                success=False,
+                errors=["Test execution timeout"]
+            )
+        finally:
+            proc.stdout.close()
 
+        passed = counts["passed"] or 0
+        failed = counts["failed"] or 0
+        errors_count = counts["error"] or 0
         total = passed + failed + errors_count
 
-        # 提取错误信息
-        errors = self._extract_errors(output)
-
-        success = result.returncode == 0
-
         test_result = TestResult(
             round=round_num,
-            success=success,
+            success=returncode == 0,
             total=total,
             passed=passed,
             failed=failed,
@@ -189,20 +174,34 @@ class TestRunner:
 
         return test_result
 
-    def _extract_errors(self, output: str) -> List[str]:
-        """提取错误信息"""
-        errors = []
+    @staticmethod
+    def _parse_output_line(line: str, counts: Dict[str, Optional[int]],
+                           errors: List[str]) -> None:
+        """增量解析单行 pytest 输出"""
+        if _ERROR_LINE_RE.search(line):
+            errors.append(line.strip())
 
-        # 提取 FAILED 行
-        for line in output.split("\n"):
-            if line.strip().startswith("FAILED"):
-                errors.append(line.strip())
-            elif "AssertionError" in line:
-                errors.append(line.strip())
-            elif "Error:" in line:
-                errors.append(line.strip())
+        # 摘要计数取首次出现的值，与全文 re.search 语义一致
+        for match in _SUMMARY_RE.finditer(line):
+            kind = match.group(2)
+            if counts[kind] is None:
+                counts[kind] = int(match.group(1))
+
+    def _get_pytest_command(self, test_file: Path) -> List[str]:
+        """获取 pytest 命令"""
+        # 在 venv 中运行 pytest
+        if os.name == "nt":  # Windows
+            pytest_bin = self.venv_path / "Scripts" / "pytest.exe"
+        else:  # Unix-like
+            pytest_bin = self.venv_path / "bin" / "pytest"
 
-        return errors
+        return [
+            str(pytest_bin),
+            str(test_file.relative_to(self.project_root)),
+            "-v",
+            "--tb=short",
+            "--color=yes"
+        ]
 
     def _attempt_fix(self, test_file: Path, result: TestResult, task: Dict) -> bool:
         """尝试修复代码
@@ -229,14 +228,9 @@ class TestRunner:
     def _get_test_file(self, source_file: str) -> Path:
         """从源文件路径获取测试文件路径"""
         # 例如：src/core/settings.py -> tests/unit/test_settings.py
-        parts = Path(source_file).parts
-        if "src" in parts:
-            idx = parts.index("src")
-            test_path = Path("tests") / "/".join(parts[idx+1:])
-        else:
-            test_path = Path("tests") / "/".join(parts[1:])
-
-        return self.project_root / f"tests/unit/test_{test_path.name}"
+        # 测试文件统一位于 tests/unit/，只需源文件的基本名
+        name = os.path.basename(source_file)
+        return self.project_root / "tests" / "unit" / f"test_{name}"
 
     def _save_report(self, task: Dict):
         """保存测试报告"""
@@ -246,31 +240,19 @@ class TestRunner:
             "file": task["file"],
             "total_rounds": len(self.results),
             "success": self.results[-1].success if self.results else False,
-            "rounds": [r.to_dict() for r in self.results]
+            # TestResult 对象直接交给编码器，省去逐轮 to_dict 中间拷贝
+            "rounds": self.results
         }
 
         report_file = self.project_root / "specs" / f"test_report_{task['id']}.json"
         report_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(report_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        # orjson 走 C 级编码器（indent=2 是标准库最慢的路径），一次写出字节
+        report_file.write_bytes(json_dumps(report, default=asdict))
 
         print(f"\n📄 测试报告已保存: {report_file}")
 
 
-def load_task(task_input: str) -> Dict:
-    """加载任务数据"""
-    task_path = Path(task_input)
-    if task_path.exists():
-        with open(task_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    try:
-        return json.loads(task_input)
-    except json.JSONDecodeError:
-        print(f"❌ 错误：无法解析任务数据: {task_input}")
-        sys.exit(1)
-
-
 def main():
     parser = argparse.ArgumentParser(description="运行测试并自动修复")
     parser.add_argument("--task", required=True, help="任务 JSON（字符串或文件路径）")
@@ -6,12 +6,67 @@ expansion support.
 """
 
 import os
-import re
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
 
+try:
+    # libyaml-backed loader; parses large configs several times faster.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _expand_env_string(value: str) -> str:
+    """Expand ``${VAR}`` and ``${VAR:-default}`` placeholders in a string.
+
+    A hand-rolled find/partition scanner handles the common short values
+    without regex-engine dispatch or match-object allocation. Placeholders
+    whose name is empty or contains ``:`` are left literal, matching the
+    previous regex grammar.
+
+    Args:
+        value: String that contains at least one ``${``.
+
+    Returns:
+        The string with placeholders replaced.
+    """
+    parts = []
+    pos = 0
+    while True:
+        start = value.find("${", pos)
+        if start == -1:
+            parts.append(value[pos:])
+            break
+        end = value.find("}", start + 2)
+        if end == -1:
+            # Unterminated placeholder stays literal.
+            parts.append(value[pos:])
+            break
+
+        name, sep, default = value[start + 2:end].partition(":-")
+        if not name or ":" in name:
+            # Not a valid placeholder; keep it literal and continue after it.
+            parts.append(value[pos:end + 1])
+            pos = end + 1
+            continue
+
+        env_value = os.environ.get(name)
+        if sep:
+            # Use env value if non-empty, otherwise the default.
+            replacement = env_value if env_value else default
+        else:
+            replacement = env_value if env_value is not None else ""
+
+        parts.append(value[pos:start])
+        parts.append(replacement)
+        pos = end + 1
+
+    return "".join(parts)
+
 
 class Settings:
     """Configuration settings loader and validator.
@@ -32,12 +87,12 @@ class Settings:
         "./settings.yml",
     ]
 
-    # Required top-level sections
-    REQUIRED_SECTIONS = [
+    # Required top-level sections (frozenset: validated with one set diff)
+    REQUIRED_SECTIONS = frozenset({
         "llm",
         "embedding",
         "vector_store",
-    ]
+    })
 
     def __init__(self, config_path: Optional[str] = None):
         """Initialize Settings.
@@ -60,6 +115,26 @@ class Settings:
             self._find_and_load_config()
 
         self._validate_config()
+        self._build_flat_index()
+
+    def _build_flat_index(self) -> None:
+        """Precompute a flat dotted-key index over the configuration.
+
+        Maps every key path (including intermediate sections) to its value,
+        e.g. {'llm': {...}, 'llm.provider': 'azure', ...}, so that get()
+        is a single dict lookup instead of a per-call split and walk.
+        """
+        flat: Dict[str, Any] = {}
+
+        def _walk(node: Dict[str, Any], prefix: str) -> None:
+            for key, value in node.items():
+                path = f"{prefix}{key}"
+                flat[path] = value
+                if isinstance(value, dict):
+                    _walk(value, path + ".")
+
+        _walk(self.config, "")
+        self._flat = flat
 
     def _find_and_load_config(self) -> None:
         """Search for configuration file in default locations.
@@ -89,14 +164,19 @@ class Settings:
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                raw_config = yaml.safe_load(f)
+            raw_text = self.config_path.read_text(encoding="utf-8")
+            raw_config = yaml.load(raw_text, Loader=_YamlLoader)
 
             if raw_config is None:
                 raise ValueError("Configuration file is empty")
 
-            # Expand environment variables
-            self.config = self._expand_env_vars(raw_config)
+            # Expand environment variables. A single substring check on the
+            # raw text lets configs without placeholders skip the recursive
+            # rebuild of every dict and list entirely.
+            if "${" in raw_text:
+                self.config = self._expand_env_vars(raw_config)
+            else:
+                self.config = raw_config
 
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML in configuration file: {e}")
@@ -109,54 +189,56 @@ class Settings:
         - ${VAR_NAME:-default} - Use environment variable if non-empty,
           otherwise use default value
 
+        Containers are mutated in place rather than rebuilt, and the walk
+        uses an explicit stack of (parent, key, value) frames instead of
+        recursion, so deep configs cost neither throwaway containers nor
+        one CPython frame per nesting level.
+
         Args:
             config: Configuration value (dict, list, or string).
 
         Returns:
             Configuration with environment variables expanded.
         """
-        if isinstance(config, dict):
-            return {k: self._expand_env_vars(v) for k, v in config.items()}
-        elif isinstance(config, list):
-            return [self._expand_env_vars(item) for item in config]
-        elif isinstance(config, str):
-            # Match ${VAR} or ${VAR:-default}
-            pattern = re.compile(r'\$\{([^}:]+)(?::-([^}]*))?\}')
-
-            def replace_env_var(match: re.Match) -> str:
-                var_name = match.group(1)
-                default_value = match.group(2) if match.group(2) is not None else ""
-
-                # Get environment variable
-                env_value = os.environ.get(var_name)
-
-                # If no default specified, return env value or empty string
-                if match.group(2) is None:
-                    return env_value if env_value is not None else ""
-
-                # If default specified, use env value if non-empty, else default
-                if env_value:
-                    return env_value
-                return default_value
-
-            return pattern.sub(replace_env_var, config)
-        else:
+        if isinstance(config, str):
+            # Fast path: most config values contain no placeholder at all,
+            # so skip the scanner entirely for them.
+            if "${" not in config:
+                return config
+            return _expand_env_string(config)
+        if not isinstance(config, (dict, list)):
             return config
 
+        stack = deque()
+
+        def _push_children(container: Any) -> None:
+            if isinstance(container, dict):
+                stack.extend((container, k, v) for k, v in container.items())
+            else:
+                stack.extend((container, i, v) for i, v in enumerate(container))
+
+        _push_children(config)
+
+        while stack:
+            parent, key, value = stack.pop()
+            if isinstance(value, str):
+                if "${" in value:
+                    parent[key] = _expand_env_string(value)
+            elif isinstance(value, (dict, list)):
+                _push_children(value)
+
+        return config
+
     def _validate_config(self) -> None:
         """Validate the loaded configuration.
 
         Raises:
             ValueError: If required sections are missing.
         """
-        missing_sections = []
-        for section in self.REQUIRED_SECTIONS:
-            if section not in self.config:
-                missing_sections.append(section)
-
+        missing_sections = self.REQUIRED_SECTIONS - self.config.keys()
         if missing_sections:
             raise ValueError(
-                f"Missing required configuration sections: {missing_sections}"
+                f"Missing required configuration sections: {sorted(missing_sections)}"
             )
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -175,16 +257,7 @@ class Settings:
             >>> settings.get('llm.temperature', 0.7)
             0.7
         """
-        keys = key.split(".")
-        value = self.config
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
+        return self._flat.get(key, default)
 
     def get_section(self, section: str) -> Dict[str, Any]:
         """Get an entire configuration section.
@@ -255,13 +328,18 @@ class Settings:
 # Global settings instance (lazy loaded)
 _global_settings: Optional[Settings] = None
 
+# Guards singleton construction; reads stay lock-free on the hot path.
+_settings_lock = threading.Lock()
+
 
 def load_settings(config_path: Optional[str] = None) -> Settings:
     """Load or get the global settings instance.
 
     This function implements a singleton pattern for settings.
     On first call, it loads the configuration. Subsequent calls
-    return the cached instance.
+    return the cached instance. Construction is guarded by a lock
+    with a double-checked fast path, so concurrent first calls
+    parse the configuration only once and share one instance.
 
     Args:
         config_path: Path to configuration file. Only used on first call.
@@ -275,8 +353,14 @@ def load_settings(config_path: Optional[str] = None) -> Settings:
     """
     global _global_settings
 
-    if _global_settings is None:
-        _global_settings = Settings(config_path)
+    # Fast path: already initialized, no lock needed.
+    if _global_settings is not None:
+        return _global_settings
+
+    with _settings_lock:
+        # Re-check under the lock; another thread may have won the race.
+        if _global_settings is None:
+            _global_settings = Settings(config_path)
 
     return _global_settings
 
@@ -291,5 +375,7 @@ def reload_settings(config_path: Optional[str] = None) -> Settings:
         The newly loaded Settings instance.
     """
     global _global_settings
-    _global_settings = Settings(config_path)
-    return _global_settings
+
+    with _settings_lock:
+        _global_settings = Settings(config_path)
+        return _global_settings
@@ -6,17 +6,79 @@ This module defines the fundamental data structures used throughout the system:
 - ChunkMetadata: Metadata associated with chunks
 
 These types are used by ingestion, retrieval, and MCP layers.
+
+All dataclasses are declared with ``slots=True``: instances are created
+once per document and once per chunk during ingestion, and dropping the
+per-instance ``__dict__`` shrinks them and speeds attribute access.
 """
 
+import hashlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-from enum import Enum
+from enum import StrEnum
+
+
+def compute_content_hash(content: str) -> str:
+    """Compute the BLAKE2b-128 hex digest of a content string.
+
+    Shared by Document and Chunk identity hashing. 128 bits is ample for
+    dedup and idempotent-upsert identity, and BLAKE2b is roughly twice
+    as fast as SHA256 on hardware without SHA extensions while halving
+    the stored hex string. ``usedforsecurity=False`` marks the digest as
+    non-cryptographic for hardened OpenSSL builds.
+
+    Args:
+        content: The text to hash.
+
+    Returns:
+        32-character lowercase hex digest.
+    """
+    return hashlib.blake2b(
+        content.encode("utf-8"), digest_size=16, usedforsecurity=False
+    ).hexdigest()
+
+
+# Below this size, thread-pool dispatch costs more than it saves.
+_HASH_BATCH_THRESHOLD = 64
 
 
-class DocumentType(Enum):
-    """Supported document types."""
+def hash_contents_batch(contents: List[str]) -> List[str]:
+    """Compute content hashes for a batch of strings.
+
+    Small batches hash inline; larger ones fan out over a thread pool
+    (hashlib releases the GIL while digesting sizeable payloads, so
+    threads parallelize for typical multi-KB chunks). Results line up
+    with :func:`compute_content_hash` element for element, so ingestion
+    code can hash a whole document's chunks once and inject the results
+    via the ``content_hash`` factory parameter.
+
+    Args:
+        contents: Chunk content strings to hash.
+
+    Returns:
+        Hex digests in the same order as ``contents``.
+    """
+    if len(contents) < _HASH_BATCH_THRESHOLD:
+        return [compute_content_hash(c) for c in contents]
+
+    with ThreadPoolExecutor() as executor:
+        chunksize = max(1, len(contents) // (os.cpu_count() or 1))
+        return list(
+            executor.map(compute_content_hash, contents, chunksize=chunksize)
+        )
+
+
+class DocumentType(StrEnum):
+    """Supported document types.
+
+    A ``StrEnum`` so members are their values: they compare equal to and
+    serialize as plain strings with no ``.value`` descriptor lookup.
+    """
     PDF = "pdf"
     MARKDOWN = "markdown"
     TEXT = "text"
@@ -24,7 +86,7 @@ class DocumentType(Enum):
     HTML = "html"
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentMetadata:
     """Metadata associated with a document.
 
@@ -62,13 +124,13 @@ class DocumentMetadata:
             "modified_at": self.modified_at.isoformat() if self.modified_at else None,
             "file_path": self.file_path,
             "file_size": self.file_size,
-            "document_type": self.document_type.value,
+            "document_type": self.document_type,
             "tags": self.tags,
             **self.custom_fields
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """Represents a loaded document.
 
@@ -78,22 +140,29 @@ class Document:
     Attributes:
         content: The raw text content of the document
         metadata: Document metadata
-        doc_id: Unique document identifier (SHA256 hash-based)
+        doc_id: Unique document identifier (content-hash based)
         sections: Optional list of section headers for navigation
     """
     content: str
     metadata: DocumentMetadata
     doc_id: Optional[str] = None
     sections: List[str] = field(default_factory=list)
+    # Word-count cache; content is treated as immutable after loading.
+    _word_count: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Generate doc_id if not provided."""
         if self.doc_id is None:
-            import hashlib
-            content_hash = hashlib.sha256(
-                f"{self.metadata.file_path}:{self.content}".encode()
-            ).hexdigest()
+            content_hash = compute_content_hash(
+                f"{self.metadata.file_path}:{self.content}"
+            )
             self.doc_id = f"doc_{content_hash[:16]}"
+        # Interned like ChunkMetadata.doc_id, so the document and all of
+        # its chunks share one str and dict lookups keyed by doc_id
+        # short-circuit on identity.
+        self.doc_id = sys.intern(self.doc_id)
 
     @property
     def char_count(self) -> int:
@@ -102,8 +171,14 @@ class Document:
 
     @property
     def word_count(self) -> int:
-        """Get approximate word count."""
-        return len(self.content.split())
+        """Get approximate word count.
+
+        Computed once on first access; repeated reads (logging, to_dict)
+        reuse the cached value instead of re-splitting the content.
+        """
+        if self._word_count is None:
+            self._word_count = len(self.content.split())
+        return self._word_count
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary.
@@ -121,7 +196,7 @@ class Document:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkMetadata:
     """Metadata associated with a chunk.
 
@@ -153,6 +228,23 @@ class ChunkMetadata:
     section_path: List[str] = field(default_factory=list)
     image_refs: List[str] = field(default_factory=list)  # References to images
     custom_fields: Dict[str, Any] = field(default_factory=dict)
+    # created_at.isoformat() cache; the timestamp never changes after creation.
+    _created_at_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        """Intern strings duplicated across every chunk of a document.
+
+        Thousands of chunks from one ingest repeat the same doc_id,
+        source path, and section names; interning collapses them to
+        shared objects, cutting heap and making equality checks pointer
+        comparisons.
+        """
+        self.doc_id = sys.intern(self.doc_id)
+        self.source = sys.intern(self.source)
+        if self.section_path:
+            self.section_path = [sys.intern(s) for s in self.section_path]
 
     @property
     def length(self) -> int:
@@ -165,6 +257,8 @@ class ChunkMetadata:
         Returns:
             Dictionary representation of metadata.
         """
+        if self._created_at_iso is None:
+            self._created_at_iso = self.created_at.isoformat()
         return {
             "chunk_id": self.chunk_id,
             "doc_id": self.doc_id,
@@ -178,18 +272,21 @@ class ChunkMetadata:
             "page_num": self.page_num,
             "section_path": self.section_path,
             "image_refs": self.image_refs,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._created_at_iso,
             **self.custom_fields
         }
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Chunk:
     """Represents a semantic unit of text from a document.
 
     A Chunk is the output of the Chunking stage and flows through
     Transform, Embedding, and Storage stages.
 
+    Equality and hashing go through ``content_hash``, so dedup sets and
+    dict lookups compare short digests instead of full content text.
+
     Attributes:
         content: The text content of this chunk
         metadata: Chunk metadata
@@ -198,14 +295,25 @@ class Chunk:
     content: str
     metadata: ChunkMetadata
     content_hash: Optional[str] = None
+    # Word-count cache; content is treated as immutable after chunking.
+    _word_count: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Generate content_hash if not provided."""
         if self.content_hash is None:
-            import hashlib
-            self.content_hash = hashlib.sha256(
-                self.content.encode("utf-8")
-            ).hexdigest()
+            self.content_hash = compute_content_hash(self.content)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare chunks by content hash."""
+        if not isinstance(other, Chunk):
+            return NotImplemented
+        return self.content_hash == other.content_hash
+
+    def __hash__(self) -> int:
+        """Hash by content hash."""
+        return hash(self.content_hash)
 
     @property
     def char_count(self) -> int:
@@ -214,8 +322,14 @@ class Chunk:
 
     @property
     def word_count(self) -> int:
-        """Get approximate word count."""
-        return len(self.content.split())
+        """Get approximate word count.
+
+        Computed once on first access; repeated reads (logging, to_dict)
+        reuse the cached value instead of re-splitting the content.
+        """
+        if self._word_count is None:
+            self._word_count = len(self.content.split())
+        return self._word_count
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary.
@@ -242,37 +356,48 @@ class Chunk:
         return self.content
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class ChunkRecord:
     """Record of a chunk in vector store with embeddings.
 
     This is the complete record stored in the vector database,
     including both dense and sparse embeddings.
 
+    Equality and hashing go through ``vector_id``, matching upsert
+    idempotency: two records for the same chunk content compare equal
+    without touching the embedding payloads.
+
     Attributes:
         chunk: The original chunk
         dense_embedding: Dense vector embedding (optional)
         sparse_embedding: Sparse BM25 vector (optional)
         upserted_at: Timestamp when upserted to vector store
+        vector_id: Unique ID combining chunk_id and content_hash
     """
     chunk: Chunk
     dense_embedding: Optional[List[float]] = None
     sparse_embedding: Optional[Dict[str, float]] = None
     upserted_at: Optional[datetime] = None
+    # Materialized once in __post_init__; hot loops key stores by it.
+    vector_id: str = field(init=False, repr=False)
 
     def __post_init__(self):
-        """Set upserted_at if not provided."""
+        """Set upserted_at and materialize vector_id."""
         if self.upserted_at is None:
             self.upserted_at = datetime.now()
+        self.vector_id = (
+            f"{self.chunk.metadata.chunk_id}_{self.chunk.content_hash[:8]}"
+        )
 
-    @property
-    def vector_id(self) -> str:
-        """Get the vector ID for this record.
+    def __eq__(self, other: object) -> bool:
+        """Compare records by vector ID."""
+        if not isinstance(other, ChunkRecord):
+            return NotImplemented
+        return self.vector_id == other.vector_id
 
-        Returns:
-            Unique ID combining chunk_id and content_hash.
-        """
-        return f"{self.chunk.metadata.chunk_id}_{self.chunk.content_hash[:8]}"
+    def __hash__(self) -> int:
+        """Hash by vector ID."""
+        return hash(self.vector_id)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary.
@@ -296,6 +421,7 @@ def create_chunk(
     chunk_index: int,
     start_offset: int,
     end_offset: int,
+    content_hash: Optional[str] = None,
     **kwargs
 ) -> Chunk:
     """Factory function to create a Chunk with proper metadata.
@@ -307,18 +433,21 @@ def create_chunk(
         chunk_index: Index in document
         start_offset: Start character offset
         end_offset: End character offset
+        content_hash: Precomputed content hash (e.g. from
+            :func:`hash_contents_batch`); computed if omitted
         **kwargs: Additional metadata fields
 
     Returns:
         A new Chunk instance.
     """
-    import hashlib
-    import uuid
-
-    # Generate unique chunk_id
-    unique_part = hashlib.sha256(
-        f"{doc_id}:{chunk_index}:{start_offset}:{end_offset}".encode()
-    ).hexdigest()[:12]
+    # Generate unique chunk_id. BLAKE2b is cheaper than SHA256 for these
+    # short keys, and a 6-byte digest (48 bits) matches the 12 hex chars
+    # the id format carries anyway.
+    unique_part = hashlib.blake2b(
+        f"{doc_id}:{chunk_index}:{start_offset}:{end_offset}".encode(),
+        digest_size=6,
+        usedforsecurity=False,
+    ).hexdigest()
     chunk_id = f"chunk_{unique_part}"
 
     # Create metadata
@@ -333,4 +462,55 @@ def create_chunk(
         **kwargs
     )
 
-    return Chunk(content=content, metadata=metadata)
+    return Chunk(content=content, metadata=metadata, content_hash=content_hash)
+
+
+def create_chunks_batch(
+    doc_id: str,
+    source: str,
+    spans: List[tuple],
+    **common_kwargs
+) -> List[Chunk]:
+    """Factory function to create many Chunks from one document at once.
+
+    Equivalent to calling :func:`create_chunk` per span, but amortizes
+    the per-chunk costs across the batch: ``datetime.now()`` is read
+    once (all chunks of an ingest share a creation timestamp) and the
+    chunk-id hash state for the shared ``doc_id`` prefix is prepared
+    once and copied per chunk. Chunk ids are identical to what
+    :func:`create_chunk` would produce for the same arguments.
+
+    Args:
+        doc_id: Source document ID shared by all chunks.
+        source: Source file path shared by all chunks.
+        spans: List of (content, chunk_index, start_offset, end_offset)
+            tuples, one per chunk.
+        **common_kwargs: Additional metadata fields applied to every chunk.
+
+    Returns:
+        A list of new Chunk instances, in span order.
+    """
+    now = datetime.now()
+
+    # Hash state for the shared "doc_id:" prefix, copied per chunk.
+    prefix_hash = hashlib.blake2b(
+        f"{doc_id}:".encode(), digest_size=6, usedforsecurity=False
+    )
+
+    chunks = []
+    for content, chunk_index, start_offset, end_offset in spans:
+        hasher = prefix_hash.copy()
+        hasher.update(f"{chunk_index}:{start_offset}:{end_offset}".encode())
+        metadata = ChunkMetadata(
+            chunk_id=f"chunk_{hasher.hexdigest()}",
+            doc_id=doc_id,
+            source=source,
+            chunk_index=chunk_index,
+            start_offset=start_offset,
+            end_offset=end_offset,
+            created_at=now,
+            **common_kwargs
+        )
+        chunks.append(Chunk(content=content, metadata=metadata))
+
+    return chunks
@@ -1,14 +1,20 @@
 """Pytest configuration and shared fixtures for RAG MCP tests."""
 
+import copy
 import os
 import sys
 import tempfile
-import shutil
 from pathlib import Path
 from typing import Generator, Dict, Any
 import pytest
 import yaml
 
+try:
+    # libyaml-backed loader, matching src/core/settings.py
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Add src to path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
@@ -39,24 +45,33 @@ def test_config_path(project_root: Path) -> Path:
     return config_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config(test_config_path: Path) -> Dict[str, Any]:
-    """Load test configuration."""
+    """Load test configuration once per session.
+
+    Treat the returned dict as read-only; tests that mutate it should
+    use ``test_config_copy`` instead.
+    """
     with open(test_config_path) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 @pytest.fixture
-def temp_dir(project_root: Path) -> Generator[Path, None, None]:
-    """Create a temporary directory for testing."""
-    temp_path = project_root / "temp_test"
-    temp_path.mkdir(parents=True, exist_ok=True)
+def test_config_copy(test_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-test deep copy of the configuration, safe to mutate."""
+    return copy.deepcopy(test_config)
 
-    yield temp_path
 
-    # Cleanup
-    if temp_path.exists():
-        shutil.rmtree(temp_path)
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    """Create a temporary directory for testing.
+
+    Uses the system temp location (tmpfs on typical Linux setups) instead
+    of a repo-local path, so tests stay off real disk and parallel runs
+    don't collide on a shared directory.
+    """
+    with tempfile.TemporaryDirectory() as temp_path:
+        yield Path(temp_path)
 
 
 @pytest.fixture
@@ -126,10 +141,17 @@ def mock_llm_response() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+# Built once at import; the fixture hands out the same vector all session.
+_MOCK_EMBEDDING = [0.1, -0.2, 0.3, -0.4, 0.5] * 30  # 1536 dimensions
+
+
+@pytest.fixture(scope="session")
 def mock_embedding() -> list[float]:
-    """Mock embedding vector for testing."""
-    return [0.1, -0.2, 0.3, -0.4, 0.5] * 30  # 1536 dimensions
+    """Mock embedding vector for testing.
+
+    Treat the returned list as read-only; copy it in tests that mutate.
+    """
+    return _MOCK_EMBEDDING
 
 
 @pytest.fixture
@@ -207,12 +229,19 @@ def sample_trace_data() -> Dict[str, Any]:
     }
 
 
-# Markers for test categories
+# Markers for test categories (mirrored in pyproject.toml for
+# --strict-markers; registering here keeps nested conftests working too)
+_MARKERS = (
+    "unit: Unit tests",
+    "integration: Integration tests",
+    "e2e: End-to-end tests",
+    "slow: Slow running tests",
+    "llm: Tests that call LLM APIs",
+    "requires_api: Tests that require API keys",
+)
+
+
 def pytest_configure(config):
     """Configure pytest markers."""
-    config.addinivalue_line("markers", "unit: Unit tests")
-    config.addinivalue_line("markers", "integration: Integration tests")
-    config.addinivalue_line("markers", "e2e: End-to-end tests")
-    config.addinivalue_line("markers", "slow: Slow running tests")
-    config.addinivalue_line("markers", "llm: Tests that call LLM APIs")
-    config.addinivalue_line("markers", "requires_api: Tests that require API keys")
+    for marker in _MARKERS:
+        config.addinivalue_line("markers", marker)
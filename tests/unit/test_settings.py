@@ -8,6 +8,12 @@ from unittest.mock import Mock, patch
 import pytest
 import yaml
 
+try:
+    # libyaml-backed dumper, mirroring the CSafeLoader used by settings
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
@@ -39,7 +45,7 @@ class TestSettings:
         }
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_YamlDumper)
             temp_path = f.name
 
         yield temp_path
@@ -85,7 +91,7 @@ class TestSettings:
         }
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_YamlDumper)
             temp_path = f.name
 
         try:
@@ -136,7 +142,7 @@ class TestSettings:
         }
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_YamlDumper)
             temp_path = f.name
 
         try:
@@ -173,7 +179,7 @@ class TestGlobalSettings:
         }
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_YamlDumper)
             temp_path = f.name
 
         try:
@@ -185,6 +191,42 @@ class TestGlobalSettings:
             os.unlink(temp_path)
             core.settings._global_settings = None
 
+    def test_load_settings_concurrent_first_call(self):
+        """Test that concurrent first calls share a single instance."""
+        import threading
+        import core.settings
+        core.settings._global_settings = None
+
+        config_data = {
+            "llm": {"provider": "azure"},
+            "embedding": {"provider": "openai"},
+            "vector_store": {"backend": "chroma"},
+        }
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            yaml.dump(config_data, f, Dumper=_YamlDumper)
+            temp_path = f.name
+
+        results = []
+        barrier = threading.Barrier(4)
+
+        def worker():
+            barrier.wait()
+            results.append(load_settings(temp_path))
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert len(results) == 4
+            assert all(s is results[0] for s in results)
+        finally:
+            os.unlink(temp_path)
+            core.settings._global_settings = None
+
     def test_reload_settings(self):
         """Test reload_settings forces reload."""
         import core.settings
@@ -202,11 +244,11 @@ class TestGlobalSettings:
         }
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data1, f)
+            yaml.dump(config_data1, f, Dumper=_YamlDumper)
             temp_path1 = f.name
 
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config_data2, f)
+            yaml.dump(config_data2, f, Dumper=_YamlDumper)
             temp_path2 = f.name
 
         try:
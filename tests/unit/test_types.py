@@ -14,7 +14,10 @@ from core.types import (
     Chunk,
     ChunkMetadata,
     ChunkRecord,
-    create_chunk
+    create_chunk,
+    create_chunks_batch,
+    compute_content_hash,
+    hash_contents_batch
 )
 
 
@@ -182,7 +185,7 @@ class TestChunk:
     def test_content_hash_generation(self, chunk):
         """Test content_hash is auto-generated."""
         assert chunk.content_hash is not None
-        assert len(chunk.content_hash) == 64  # SHA256 hex length
+        assert len(chunk.content_hash) == 32  # BLAKE2b-128 hex length
 
     def test_char_count(self, chunk):
         """Test character count."""
@@ -211,6 +214,20 @@ class TestChunk:
         assert "metadata" in result
         assert "content_hash" in result
 
+    def test_equality_by_content_hash(self, chunk, chunk_metadata):
+        """Test chunks with identical content compare equal."""
+        other = Chunk(content=chunk.content, metadata=chunk_metadata)
+        different = Chunk(content="Other content.", metadata=chunk_metadata)
+
+        assert chunk == other
+        assert chunk != different
+        assert chunk != "not a chunk"
+
+    def test_hashable_for_dedup(self, chunk, chunk_metadata):
+        """Test chunks dedup by content in sets."""
+        duplicate = Chunk(content=chunk.content, metadata=chunk_metadata)
+        assert len({chunk, duplicate}) == 1
+
 
 class TestChunkRecord:
     """Test ChunkRecord class."""
@@ -299,3 +316,75 @@ class TestCreateChunk:
         assert chunk.metadata.title == "Test Title"
         assert chunk.metadata.tags == ["test"]
         assert chunk.metadata.page_num == 1
+
+
+class TestCreateChunksBatch:
+    """Test create_chunks_batch factory function."""
+
+    def test_batch_matches_single_factory(self):
+        """Test batch chunks match per-chunk factory output."""
+        spans = [("First chunk", 0, 0, 11), ("Second chunk", 1, 11, 23)]
+        chunks = create_chunks_batch("doc_123", "/path/to/doc.pdf", spans)
+
+        assert len(chunks) == 2
+        for chunk, (content, index, start, end) in zip(chunks, spans):
+            single = create_chunk(
+                content=content,
+                doc_id="doc_123",
+                source="/path/to/doc.pdf",
+                chunk_index=index,
+                start_offset=start,
+                end_offset=end
+            )
+            assert chunk.content == content
+            assert chunk.metadata.chunk_id == single.metadata.chunk_id
+            assert chunk.content_hash == single.content_hash
+
+    def test_batch_shares_timestamp(self):
+        """Test all chunks in a batch share one creation timestamp."""
+        spans = [("a", 0, 0, 1), ("b", 1, 1, 2), ("c", 2, 2, 3)]
+        chunks = create_chunks_batch("doc_123", "test.txt", spans)
+
+        timestamps = {c.metadata.created_at for c in chunks}
+        assert len(timestamps) == 1
+
+    def test_batch_common_kwargs(self):
+        """Test common metadata fields apply to every chunk."""
+        spans = [("a", 0, 0, 1), ("b", 1, 1, 2)]
+        chunks = create_chunks_batch(
+            "doc_123", "test.txt", spans, page_num=7
+        )
+
+        assert all(c.metadata.page_num == 7 for c in chunks)
+
+
+class TestHashContentsBatch:
+    """Test hash_contents_batch helper."""
+
+    def test_matches_single_helper(self):
+        """Test batch hashes match compute_content_hash per element."""
+        contents = [f"chunk content {i}" for i in range(10)]
+        assert hash_contents_batch(contents) == [
+            compute_content_hash(c) for c in contents
+        ]
+
+    def test_large_batch_order_preserved(self):
+        """Test the threaded path keeps input order."""
+        contents = [f"chunk content {i}" for i in range(200)]
+        assert hash_contents_batch(contents) == [
+            compute_content_hash(c) for c in contents
+        ]
+
+    def test_create_chunk_accepts_precomputed_hash(self):
+        """Test create_chunk injects a precomputed content hash."""
+        precomputed = compute_content_hash("Test content")
+        chunk = create_chunk(
+            content="Test content",
+            doc_id="doc_123",
+            source="test.txt",
+            chunk_index=0,
+            start_offset=0,
+            end_offset=12,
+            content_hash=precomputed
+        )
+        assert chunk.content_hash == precomputed